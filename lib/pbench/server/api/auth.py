@@ -1,6 +1,8 @@
 import jwt
 import os
 import datetime
+from threading import Lock
+from cachetools import TTLCache
 from flask import request, abort
 from flask_httpauth import HTTPTokenAuth
 from pbench.server.database.models.users import User
@@ -22,6 +24,16 @@ class UnknownUser(Exception):
 class Auth:
     token_auth = HTTPTokenAuth("Bearer")
 
+    # Usernames which have recently been validated, so that repeated queries
+    # on behalf of the same user don't each require a database lookup. Only
+    # successful validations are remembered, so a newly registered user is
+    # recognized immediately. The cache is per process: forget_user drops a
+    # deleted or renamed user only in the process handling that request, so
+    # other worker processes may continue to accept the old username for up
+    # to the 60 second TTL.
+    valid_users = TTLCache(maxsize=4096, ttl=60)
+    valid_users_lock = Lock()
+
     @staticmethod
     def set_logger(logger):
         # Logger gets set at the time of auth module initialization
@@ -56,6 +68,9 @@ class Auth:
         Returns:
             The specified username if it's valid; does not return on failure
         """
+        with Auth.valid_users_lock:
+            if name in Auth.valid_users:
+                return name
         try:
             user = User.query(username=name)
         except Exception:
@@ -63,8 +78,22 @@ class Auth:
             raise
         if not user:
             raise UnknownUser(name)
+        with Auth.valid_users_lock:
+            Auth.valid_users[name] = True
         return name
 
+    @staticmethod
+    def forget_user(name: str):
+        """
+        Remove a username from the cache of recently validated users, so that
+        the next validation of that username queries the database.
+
+        Args:
+            :name: The username field of a user
+        """
+        with Auth.valid_users_lock:
+            Auth.valid_users.pop(name, None)
+
     def encode_auth_token(self, token_expire_duration, user_id):
         """
         Generates the Auth Token
@@ -1,15 +1,19 @@
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from logging import Logger
-from typing import Any, AnyStr, Callable, Dict, List
+from typing import Any, AnyStr, Callable, Dict, List, Tuple, Union
 from urllib.parse import urljoin
 
+import orjson
 import requests
 from dateutil import parser as date_parser
 from dateutil import rrule
 from dateutil.relativedelta import relativedelta
-from flask import request
+from flask import Response, g, request
 from flask_restful import Resource, abort
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from pbench.server import PbenchServerConfig
 from pbench.server.api.auth import Auth
@@ -67,6 +71,16 @@ class ConversionError(SchemaError):
         return f"Value {self.value!r} ({self.actual_type}) cannot be parsed as a {self.expected_type}"
 
 
+# The date/time formats our clients normally use, most common first; these
+# are tried before resorting to dateutil's much slower heuristic parser.
+DATE_FORMATS = (
+    "%Y-%m",
+    "%Y-%m-%d",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S.%f",
+)
+
+
 def convert_date(value: str) -> datetime:
     """
     convert_date Convert a date/time string to a datetime.datetime object.
@@ -80,6 +94,12 @@ def convert_date(value: str) -> datetime:
     Returns:
         datetime.datetime object
     """
+    if type(value) is str:
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(value, fmt)
+            except ValueError:
+                pass
     try:
         return date_parser.parse(value)
     except Exception:
@@ -133,6 +153,29 @@ def convert_json(value: dict) -> dict:
     return value
 
 
+def convert_query(value: Union[dict, List[dict]]) -> Union[dict, List[dict]]:
+    """
+    convert_query Process an Elasticsearch query parameter, which may be a
+    single JSON query dict or a list of JSON query dicts to be run as a
+    multi-search, by validating that it's a Python dict or a list of Python
+    dicts.
+
+    Args:
+        value: JSON dict or list of JSON dicts
+
+    Raises:
+        ConversionError: input can't be converted
+
+    Returns:
+        The JSON dict or list
+    """
+    if type(value) is list:
+        for v in value:
+            convert_json(v)
+        return value
+    return convert_json(value)
+
+
 def convert_string(value: str) -> str:
     """
     convert_string Verify that the parameter value is a string (e.g.,
@@ -163,6 +206,7 @@ class ParamType(Enum):
     DATE = ("Date", convert_date)
     USER = ("User", convert_username)
     JSON = ("Json", convert_json)
+    QUERY = ("Query", convert_query)
     STRING = ("String", convert_string)
 
     def __init__(self, name: AnyStr, convert: Callable[[AnyStr], Any]):
@@ -185,6 +229,8 @@ class Parameter:
     Note that a parameter that's "required" must also be non-empty.
     """
 
+    __slots__ = ("name", "type", "required")
+
     def __init__(self, name: AnyStr, type: ParamType, required: bool = False):
         """
         __init__ Initialize a Parameter object describing a JSON parameter
@@ -241,6 +287,12 @@ class Schema:
         """
         self.parameters = {p.name: p for p in parameters}
 
+        # Resolve the parameter attributes and conversion methods once here,
+        # so that validating each request is a flat loop over local lookups.
+        self._required_names = frozenset(p.name for p in parameters if p.required)
+        self._known_names = frozenset(self.parameters)
+        self._converters = {p.name: p.type.convert for p in parameters}
+
     def validate(self, json_data: Dict[AnyStr, Any]) -> Dict[AnyStr, Any]:
         """
         validate Validate an incoming JSON document against the schema and
@@ -255,20 +307,88 @@ class Schema:
         if not json_data:
             raise InvalidRequestPayload()
 
-        bad_keys = [n for n, p in self.parameters.items() if p.invalid(json_data)]
-        if len(bad_keys) > 0:
-            raise MissingParameters(bad_keys)
+        converters = self._converters
+
+        # A parameter is invalid if it's required and not specified at all,
+        # or if it's specified with an empty value (see Parameter.invalid).
+        bad = self._required_names.difference(json_data)
+        bad |= {
+            n for n in self._known_names.intersection(json_data) if not json_data[n]
+        }
+        if bad:
+            # Report the invalid parameters in schema order
+            raise MissingParameters([n for n in converters if n in bad])
 
         processed = {}
-        for p in json_data:
-            tp = self.parameters.get(p)
-            processed[p] = tp.type.convert(json_data[p]) if tp else json_data[p]
+        for n, v in json_data.items():
+            convert = converters.get(n)
+            processed[n] = convert(v) if convert else v
         return processed
 
     def __str__(self) -> str:
         return f"Schema<{self.parameters}>"
 
 
+# The largest Elasticsearch response body, in bytes, that ElasticBase will
+# memoize for the duration of a client request.
+MEMO_MAX_SIZE = 64 * 1024
+
+# All Elasticsearch queries share a single requests session, so that
+# connections to Elasticsearch are pooled and reused across client requests
+# rather than being set up for every query. (This can't be done in the
+# ElasticBase constructor, as flask_restful constructs a new resource object
+# for each client request.)
+es_session = requests.Session()
+es_session.mount(
+    "http://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=64,
+        max_retries=Retry(connect=3, read=0, backoff_factor=0.1),
+    ),
+)
+
+
+@lru_cache(maxsize=1024)
+def _month_range(
+    prefix: str, index: str, first: Tuple[int, int], last: Tuple[int, int]
+) -> str:
+    """
+    _month_range Construct the comma-separated list of month-qualified index
+    names for ElasticBase._gen_month_range.
+
+    The list depends only on the index names and the first and last (year,
+    month) of the range, so it's cached: clients tend to repeat queries over
+    the same date range.
+
+    Args:
+        prefix: The server's index prefix
+        index: The desired monthly index root
+        first: The (year, month) of the start time
+        last: The (year, month) of the end time
+
+    Returns:
+        A comma-separated list of month-qualified index names
+    """
+    monthResults = list()
+    queryString = ""
+    first_month = datetime(*first, 1)
+    last_month = datetime(*last, 1) + relativedelta(day=31)
+    for m in rrule.rrule(rrule.MONTHLY, dtstart=first_month, until=last_month):
+        monthResults.append(m.strftime("%Y-%m"))
+
+    # TODO: hardcoding the index here is risky. We need a framework to
+    # help the web services understand index versions and template
+    # formats, probably by building a persistent database from the
+    # index template documents at startup. This is TBD.
+    for monthValue in monthResults:
+        if index == "v4.result-data.":
+            queryString += f"{prefix + index + monthValue}-*,"
+        else:
+            queryString += f"{prefix + index + monthValue},"
+    return queryString
+
+
 class ElasticBase(Resource):
     """
     ElasticBase A base class for Elasticsearch queries that allows subclasses
@@ -283,8 +403,18 @@ class ElasticBase(Resource):
     Elasticsearch request payload from Pbench server data and the client's
     JSON payload, and to "postprocess" a successful response payload from
     Elasticsearch.
+
+    A subclass which returns the Elasticsearch response payload unchanged
+    can instead set "passthrough" to True: the response body is then
+    returned to the caller as-is, without being decoded and re-encoded, and
+    postprocess is not called. Only a cheap sanity check is made that the
+    body is JSON (that it starts with a JSON object or array), so that a
+    non-JSON response (e.g., "_cat" text output) is reported as an internal
+    error rather than returned to the caller as "application/json".
     """
 
+    passthrough = False
+
     def __init__(self, config: PbenchServerConfig, logger: Logger, schema: Schema):
         """
         __init__ Construct the base class
@@ -349,23 +479,26 @@ class ElasticBase(Resource):
         Returns:
             A comma-separated list of month-qualified index names
         """
-        monthResults = list()
-        queryString = ""
-        first_month = start.replace(day=1)
-        last_month = end + relativedelta(day=31)
-        for m in rrule.rrule(rrule.MONTHLY, dtstart=first_month, until=last_month):
-            monthResults.append(m.strftime("%Y-%m"))
-
-        # TODO: hardcoding the index here is risky. We need a framework to
-        # help the web services understand index versions and template
-        # formats, probably by building a persistent database from the
-        # index template documents at startup. This is TBD.
-        for monthValue in monthResults:
-            if index == "v4.result-data.":
-                queryString += f"{self.prefix + index + monthValue}-*,"
-            else:
-                queryString += f"{self.prefix + index + monthValue},"
-        return queryString
+        return _month_range(
+            self.prefix, index, (start.year, start.month), (end.year, end.month)
+        )
+
+    def _gen_msearch(self, index: str, queries: List[Dict[AnyStr, Any]]) -> bytes:
+        """
+        _gen_msearch Construct the newline-delimited JSON body of an
+        Elasticsearch /_msearch request which runs each of a list of queries
+        against the same index, so that they can be sent to Elasticsearch
+        in a single HTTP request rather than one request per query.
+
+        Args:
+            index: The index (or comma-separated list of indices) to search
+            queries: A list of Elasticsearch search bodies
+
+        Returns:
+            The /_msearch request body
+        """
+        header = orjson.dumps({"index": index}) + b"\n"
+        return b"".join(header + orjson.dumps(q) + b"\n" for q in queries)
 
     def assemble(self, json_data: Dict[AnyStr, Any]) -> Dict[AnyStr, Any]:
         """
@@ -410,29 +543,21 @@ class ElasticBase(Resource):
         """
         raise NotImplementedError()
 
-    def _call(self, method: Callable, json_data: Dict[AnyStr, Any]):
+    def _query(self, method: Callable, url: str, kwargs: Dict[AnyStr, Any]) -> bytes:
         """
-        _call Perform the requested call to Elasticsearch, and handle any
-        exceptions.
+        _query Send a query to Elasticsearch, and handle any exceptions.
 
         Args:
-            method: Any requests HTTP method (e.g., requests.post)
-            json_data: Type-normalized client JSON input
+            method: Any requests HTTP method (e.g., es_session.post)
+            url: The full Elasticsearch URI
+            kwargs: A kwargs dict for the requests API
 
         Returns:
-            Postprocessed JSON body to return to client
+            The raw Elasticsearch response body
         """
-        try:
-            es_request = self.assemble(json_data)
-            path = es_request.get("path")
-            url = urljoin(self.es_url, path)
-        except Exception as e:
-            self.logger.exception("Blew it in setup: {}", type(e).__name__)
-            abort(500, message="INTERNAL ERROR")
-
         try:
             # query Elasticsearch
-            es_response = method(url, **es_request["kwargs"])
+            es_response = method(url, **kwargs)
             es_response.raise_for_status()
         except requests.exceptions.HTTPError as e:
             self.logger.exception("HTTP error {} from Elasticsearch request", e)
@@ -460,12 +585,55 @@ class ElasticBase(Resource):
             )
             abort(500, message="INTERNAL ERROR")
 
+        return es_response.content
+
+    def _call(self, method: Callable, json_data: Dict[AnyStr, Any]):
+        """
+        _call Perform the requested call to Elasticsearch, and handle any
+        exceptions.
+
+        Args:
+            method: Any requests HTTP method (e.g., es_session.post)
+            json_data: Type-normalized client JSON input
+
+        Returns:
+            Postprocessed JSON body to return to client
+        """
+        try:
+            es_request = self.assemble(json_data)
+            path = es_request.get("path")
+            url = urljoin(self.es_url, path)
+        except Exception as e:
+            self.logger.exception("Blew it in setup: {}", type(e).__name__)
+            abort(500, message="INTERNAL ERROR")
+
+        # Small Elasticsearch responses (such as counts, aggregations, and
+        # index aliases) are memoized for the duration of a client request,
+        # so that an identical query made more than once while handling the
+        # request is only sent to Elasticsearch once. Larger responses (such
+        # as lists of hits) aren't kept beyond the postprocess call. We keep
+        # the raw response body rather than the decoded JSON since postprocess
+        # methods are free to modify the JSON they're given.
+        cache = g.setdefault("elasticsearch_results", {})
+        key = repr((method.__name__, url, es_request["kwargs"]))
+        es_body = cache.get(key)
+        if es_body is None:
+            es_body = self._query(method, url, es_request["kwargs"])
+            if len(es_body) <= MEMO_MAX_SIZE:
+                cache[key] = es_body
+
+        if self.passthrough:
+            if es_body.lstrip()[:1] in (b"{", b"["):
+                return Response(es_body, mimetype="application/json")
+            self.logger.error("Elasticsearch response {} is not JSON", es_body[:1024])
+            abort(500, message="INTERNAL ERROR")
+
         try:
-            return self.postprocess(es_response.json())
+            return self.postprocess(orjson.loads(es_body))
         except Exception as e:
             self.logger.exception(
                 "Unexpected problem postprocessing Elasticsearch response {}: {}",
-                es_response.json(),
+                es_body,
                 e,
             )
             abort(500, message="INTERNAL ERROR")
@@ -493,7 +661,7 @@ class ElasticBase(Resource):
             # be interpreted as formatting commands.
             self.logger.warning("{}", str(e))
             abort(400, message=str(e))
-        return self._call(requests.post, new_data)
+        return self._call(es_session.post, new_data)
 
     def get(self):
         """
@@ -501,4 +669,4 @@ class ElasticBase(Resource):
         instance. The post-processing of the Elasticsearch query is handled
         the subclasses through their postprocess() methods.
         """
-        return self._call(requests.get, None)
+        return self._call(es_session.get, None)
@@ -1,6 +1,7 @@
-from dateutil import parser
-from flask import jsonify
+import orjson
+from flask import Response
 from logging import Logger
+from operator import itemgetter
 from typing import Any, AnyStr, Dict
 
 from pbench.server import PbenchServerConfig
@@ -11,12 +12,79 @@ from pbench.server.api.resources.query_apis import (
     ParamType,
 )
 
+# Fetch the required run document fields with a single call.
+_run_fields = itemgetter("name", "controller", "start", "end", "id")
+
+
+def _format_dataset(hit: Dict[AnyStr, Any]) -> Dict[AnyStr, Any]:
+    """
+    _format_dataset Construct the run document returned to the client for
+    one Elasticsearch hit.
+
+    Optional fields which are missing from the Elasticsearch document are
+    omitted, rather than returned as null values.
+
+    Args:
+        hit: An Elasticsearch hit
+
+    Returns:
+        The client run document
+    """
+    src = hit["_source"]
+    run = src["run"]
+    name, controller, start, end, run_id = _run_fields(run)
+    d = {
+        "key": name,
+        "run.name": name,
+        "run.controller": controller,
+        "run.start": start,
+        "run.end": end,
+        "id": run_id,
+        "startUnixTimestamp": hit["sort"][1],
+    }
+    if "config" in run:
+        d["run.config"] = run["config"]
+    if "prefix" in run:
+        d["run.prefix"] = run["prefix"]
+    meta = src.get("@metadata")
+    if meta:
+        if "controller_dir" in meta:
+            d["@metadata.controller_dir"] = meta["controller_dir"]
+        if "satellite" in meta:
+            d["@metadata.satellite"] = meta["satellite"]
+    return d
+
 
 class DatasetsList(ElasticBase):
     """
     Get a list of dataset run documents for a controller.
     """
 
+    # The constant part of the Elasticsearch query body. This is built once,
+    # here, rather than in __init__, because flask_restful constructs a new
+    # resource object for each client request.
+    _base_body = {
+        "_source": {
+            "includes": [
+                "@metadata.controller_dir",
+                "@metadata.satellite",
+                "run.controller",
+                "run.start",
+                "run.end",
+                "run.name",
+                "run.config",
+                "run.prefix",
+                "run.id",
+            ]
+        },
+        # Elasticsearch reports the value of each sort key for every hit, as
+        # epoch milliseconds for date fields; the secondary "run.start" key
+        # gives us the start timestamp without having to parse the date
+        # string.
+        "sort": [{"run.end": {"order": "desc"}}, {"run.start": {"order": "desc"}}],
+        "size": 5000,
+    }
+
     def __init__(self, config: PbenchServerConfig, logger: Logger):
         super().__init__(
             config,
@@ -76,34 +144,22 @@ class DatasetsList(ElasticBase):
         # the indexer without re-loading on each access. For now, the index
         # version is hardcoded.
         uri_fragment = self._gen_month_range(".v6.run-data.", start, end)
+
+        # Only the query filter varies between requests: reuse the rest of
+        # the (shallow copied) constant query body.
+        body = self._base_body.copy()
+        body["query"] = {
+            "bool": {
+                "filter": [
+                    {"term": self._get_user_term(user)},
+                    {"term": {"run.controller": controller}},
+                ]
+            }
+        }
         return {
             "path": f"/{uri_fragment}/_search",
             "kwargs": {
-                "json": {
-                    "_source": {
-                        "includes": [
-                            "@metadata.controller_dir",
-                            "@metadata.satellite",
-                            "run.controller",
-                            "run.start",
-                            "run.end",
-                            "run.name",
-                            "run.config",
-                            "run.prefix",
-                            "run.id",
-                        ]
-                    },
-                    "sort": {"run.end": {"order": "desc"}},
-                    "query": {
-                        "bool": {
-                            "filter": [
-                                {"term": self._get_user_term(user)},
-                                {"term": {"run.controller": controller}},
-                            ]
-                        }
-                    },
-                    "size": 5000,
-                }
+                "json": body,
             },
         }
 
@@ -114,7 +170,7 @@ class DatasetsList(ElasticBase):
         [
             {
                 "key": "fio_rhel8_kvm_perf43_preallocfull_nvme_run4_iothread_isolcpus_2020.04.29T12.49.13",
-                "startUnixTimestamp": 1588178953561,
+                "startUnixTimestamp": 1588164553560,
                 "run.name": "fio_rhel8_kvm_perf43_preallocfull_nvme_run4_iothread_isolcpus_2020.04.29T12.49.13",
                 "run.controller": "dhcp31-187.example.com,
                 "run.start": "2020-04-29T12:49:13.560620",
@@ -122,41 +178,14 @@ class DatasetsList(ElasticBase):
             }
         ]
         """
-        datasets = []
         hits = es_json["hits"]["hits"]
-        self.logger.info("{} controllers found", len(hits))
-        for dataset in hits:
-            src = dataset["_source"]
-            run = src["run"]
-            d = {
-                "key": run["name"],
-                "run.name": run["name"],
-                "run.controller": run["controller"],
-                "run.start": run["start"],
-                "run.end": run["end"],
-                "id": run["id"],
-            }
-            try:
-                timestamp = parser.parse(run["start"]).utcfromtimestamp()
-            except Exception as e:
-                self.logger.info(
-                    "Can't parse start time {} to integer timestamp: {}",
-                    run["start"],
-                    e,
-                )
-                timestamp = dataset["sort"][0]
-
-            d["startUnixTimestamp"] = timestamp
-            if "config" in run:
-                d["run.config"] = run["config"]
-            if "prefix" in run:
-                d["run.prefix"] = run["prefix"]
-            if "@metadata" in src:
-                meta = src["@metadata"]
-                if "controller_dir" in meta:
-                    d["@metadata.controller_dir"] = meta["controller_dir"]
-                if "satellite" in meta:
-                    d["@metadata.satellite"] = meta["satellite"]
-            datasets.append(d)
+        self.logger.info("{} datasets found", len(hits))
+
+        # Each run document is encoded as soon as it's formatted, so we never
+        # hold more than one formatted document. The whole body is built here,
+        # rather than streamed, so that a malformed hit is reported through
+        # ElasticBase's postprocess error handling before any response starts.
+        body = b"[" + b",".join(orjson.dumps(_format_dataset(h)) for h in hits) + b"]"
+
         # construct response object
-        return jsonify(datasets)
+        return Response(body, mimetype="application/json")
@@ -13,6 +13,8 @@ from pbench.server.api.resources.query_apis import (
 class Elasticsearch(ElasticBase):
     """Elasticsearch API for post request via server."""
 
+    passthrough = True
+
     def __init__(self, config: PbenchServerConfig, logger: Logger):
         """
         __init__ Configure the Elasticsearch passthrough class
@@ -33,19 +35,35 @@ class Elasticsearch(ElasticBase):
             logger,
             Schema(
                 Parameter("indices", ParamType.STRING, required=True),
-                Parameter("payload", ParamType.JSON),
+                Parameter("payload", ParamType.QUERY),
                 Parameter("params", ParamType.JSON),
             ),
         )
 
     def assemble(self, json_data: Dict[AnyStr, Any]) -> Dict[AnyStr, Any]:
+        """
+        Pass the client's query through to Elasticsearch.
+
+        The "indices" parameter is normally the path of the Elasticsearch URI.
+        If the "payload" is a list of queries, however, "indices" is instead
+        the index (or comma-separated list of indices) against which each
+        query is run, and the queries are sent to Elasticsearch together in
+        a single /_msearch request.
+        """
+        payload = json_data.get("payload")
+        if type(payload) is list:
+            return {
+                "path": "/_msearch",
+                "kwargs": {
+                    "data": self._gen_msearch(json_data["indices"], payload),
+                    "headers": {"Content-Type": "application/x-ndjson"},
+                    "params": json_data.get("params"),
+                },
+            }
         return {
             "path": json_data["indices"],
             "kwargs": {
-                "json": json_data.get("payload"),
+                "json": payload,
                 "params": json_data.get("params"),
             },
         }
-
-    def postprocess(self, es_json: Dict[AnyStr, Any]) -> Dict[AnyStr, Any]:
-        return es_json
@@ -427,11 +427,14 @@ class UserAPI(Resource):
                     post_data[field],
                 )
                 abort(403, message="Invalid update request payload")
+        old_username = user.username
         try:
             user.update(**post_data)
         except Exception:
             self.logger.exception("Exception occurred during updating user object")
             abort(500, message="INTERNAL ERROR")
+        if user.username != old_username:
+            Auth.forget_user(old_username)
 
         response_object = user.get_json()
         return make_response(jsonify(response_object), 200)
@@ -473,6 +476,7 @@ class UserAPI(Resource):
             # Do not delete if the user is admin
             if not user.is_admin():
                 User.delete(username)
+                Auth.forget_user(username)
         except Exception:
             self.logger.exception(
                 "Exception occurred during deleting the user entry for user '{}'",
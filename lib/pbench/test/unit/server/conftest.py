@@ -3,7 +3,7 @@ import tempfile
 import pytest
 from pathlib import Path
 from pbench.server.api import create_app, get_server_config
-from pbench.server.api.auth import Auth
+from pbench.server.api.auth import Auth, UnknownUser
 
 
 server_cfg_tmpl = """[DEFAULT]
@@ -117,3 +117,16 @@ def user_ok(monkeypatch):
         return user
 
     monkeypatch.setattr(Auth, "validate_user", ok)
+
+
+@pytest.fixture
+def user_unknown(monkeypatch):
+    """
+    Override the Auth.validate_user method to reject every username without
+    checking the database.
+    """
+
+    def unknown(user: str) -> str:
+        raise UnknownUser(user)
+
+    monkeypatch.setattr(Auth, "validate_user", unknown)
@@ -113,7 +113,7 @@ class TestDatasetsList:
             == "Value '2020-19' (str) cannot be parsed as a date/time string"
         )
 
-    def test_query(self, client, server_config, query_helper, user_ok):
+    def test_query(self, client, server_config, query_helper, requests_mock, user_ok):
         """
         test_query Check the construction of Elasticsearch query URI
         and filtering of the response body.
@@ -149,7 +149,7 @@ class TestDatasetsList:
                                 "config": "rhel8_kvm_perf43_preallocfull_nvme_run4_iothread_isolcpus",
                             },
                         },
-                        "sort": [1588167004918],
+                        "sort": [1588167004918, 1588164553560],
                     }
                 ],
             },
@@ -157,6 +157,15 @@ class TestDatasetsList:
 
         index = self.build_index(server_config, ("2020-08", "2020-09", "2020-10"))
         response = query_helper(json, index, 200, server_config, json=response_payload)
+        es_body = requests_mock.last_request.json()
+        assert es_body["query"]["bool"]["filter"] == [
+            {"term": {"authorization.owner": "drb"}},
+            {"term": {"run.controller": "dbutenho.csb"}},
+        ]
+        assert es_body["sort"] == [
+            {"run.end": {"order": "desc"}},
+            {"run.start": {"order": "desc"}},
+        ]
         res_json = response.json
         assert isinstance(res_json, list)
         assert len(res_json) == 1
@@ -176,9 +185,82 @@ class TestDatasetsList:
         )
         assert res_json[0]["run.start"] == "2020-04-29T12:49:13.560620"
         assert res_json[0]["run.end"] == "2020-04-29T13:30:04.918704"
-        assert res_json[0]["startUnixTimestamp"] == 1588167004918
+        assert res_json[0]["startUnixTimestamp"] == 1588164553560
         assert res_json[0]["id"] == "12fb1e952fd826727810868c9327254f"
 
+    def test_query_many(self, client, server_config, query_helper, user_ok):
+        """
+        test_query_many Check that a response with many hits is returned as a
+        single, complete, ordered list, and that missing optional fields are
+        omitted.
+        """
+        json = {
+            "user": "drb",
+            "controller": "dbutenho.csb",
+            "start": "2020-08",
+            "end": "2020-08",
+        }
+        count = 2500
+        hits = [
+            {
+                "_index": "drb.v6.run-data.2020-08",
+                "_id": f"id{i}",
+                "_source": {
+                    "run": {
+                        "controller": "dbutenho.csb",
+                        "name": f"run{i}",
+                        "start": "2020-08-01T00:00:00.000000",
+                        "end": "2020-08-01T01:00:00.000000",
+                        "id": f"id{i}",
+                    },
+                },
+                "sort": [1596243600000, 1596240000000],
+            }
+            for i in range(count)
+        ]
+        response_payload = {"hits": {"total": {"value": count}, "hits": hits}}
+
+        index = self.build_index(server_config, ("2020-08",))
+        response = query_helper(json, index, 200, server_config, json=response_payload)
+        res_json = response.json
+        assert [d["key"] for d in res_json] == [f"run{i}" for i in range(count)]
+        assert "run.config" not in res_json[0]
+        assert "@metadata.controller_dir" not in res_json[0]
+
+    def test_malformed_hit(self, client, server_config, query_helper, user_ok):
+        """
+        test_malformed_hit Check that an Elasticsearch hit missing a required
+        field is reported as an internal error.
+        """
+        json = {
+            "user": "drb",
+            "controller": "dbutenho.csb",
+            "start": "2020-08",
+            "end": "2020-08",
+        }
+        response_payload = {
+            "hits": {
+                "total": {"value": 1},
+                "hits": [
+                    {
+                        "_source": {
+                            "run": {
+                                "name": "run0",
+                                "start": "2020-08-01T00:00:00.000000",
+                                "end": "2020-08-01T01:00:00.000000",
+                                "id": "id0",
+                            },
+                        },
+                        "sort": [1596243600000, 1596240000000],
+                    }
+                ],
+            }
+        }
+
+        index = self.build_index(server_config, ("2020-08",))
+        response = query_helper(json, index, 500, server_config, json=response_payload)
+        assert response.json.get("message") == "INTERNAL ERROR"
+
     @pytest.mark.parametrize(
         "exceptions",
         (
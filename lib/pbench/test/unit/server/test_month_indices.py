@@ -2,6 +2,11 @@ import pytest
 import re
 import requests
 
+from flask import g
+
+from pbench.server.api.resources.query_apis import MEMO_MAX_SIZE, es_session
+from pbench.server.api.resources.query_apis.month_indices import MonthIndices
+
 
 @pytest.fixture
 def get_helper(client, server_config, requests_mock):
@@ -121,3 +126,43 @@ class TestMonthIndices:
         get_helper(
             exceptions["status"], server_config, exc=exceptions["exception"],
         )
+
+    def test_memoized(self, client, server_config, requests_mock):
+        """
+        test_memoized Check that a repeated Elasticsearch query within the
+        same client request is only sent to Elasticsearch once, while a new
+        client request queries Elasticsearch again.
+        """
+        requests_mock.get(
+            "http://elasticsearch.example.com:7080/_aliases",
+            json={"unit-test.v6.run-data.2020-12": {"aliases": {}}},
+        )
+        months = MonthIndices(server_config, client.logger)
+        with client.application.test_request_context():
+            first = months._call(es_session.get, None)
+            second = months._call(es_session.get, None)
+        assert requests_mock.call_count == 1
+        assert first.json == second.json == ["2020-12"]
+
+        with client.application.test_request_context():
+            months._call(es_session.get, None)
+        assert requests_mock.call_count == 2
+
+    def test_not_memoized(self, client, server_config, requests_mock):
+        """
+        test_not_memoized Check that a large Elasticsearch response isn't
+        kept for the rest of the client request.
+        """
+        aliases = {
+            f"unit-test.v6.run-data.{i:06d}": {"aliases": {}}
+            for i in range(MEMO_MAX_SIZE // 32)
+        }
+        requests_mock.get(
+            "http://elasticsearch.example.com:7080/_aliases", json=aliases
+        )
+        months = MonthIndices(server_config, client.logger)
+        with client.application.test_request_context():
+            months._call(es_session.get, None)
+            months._call(es_session.get, None)
+            assert not g.elasticsearch_results
+        assert requests_mock.call_count == 2
@@ -76,6 +76,72 @@ class TestElasticsearch:
         )
         assert response.status_code == 400
 
+    @staticmethod
+    def test_list_params(client, server_config, requests_mock):
+        response = client.post(
+            f"{server_config.rest_uri}/elasticsearch",
+            json={
+                "indices": "some_index/_search",
+                "payload": {"size": 0},
+                "params": [{"size": 1}],
+            },
+        )
+        assert response.status_code == 400
+        assert (
+            response.json.get("message")
+            == "Value [{'size': 1}] (list) cannot be parsed as a dict"
+        )
+        assert not requests_mock.called
+
+    @staticmethod
+    def test_passthrough(client, server_config, requests_mock):
+        es_payload = b'{"hits": {"total": {"value": 0}, "hits": []}}'
+        requests_mock.post(
+            "http://elasticsearch.example.com:7080/some_index/_search",
+            content=es_payload,
+        )
+        response = client.post(
+            f"{server_config.rest_uri}/elasticsearch",
+            json={"indices": "some_index/_search", "payload": {"size": 0}},
+        )
+        assert response.status_code == 200
+        assert response.mimetype == "application/json"
+        assert response.data == es_payload
+
+    @staticmethod
+    def test_passthrough_not_json(client, server_config, requests_mock):
+        requests_mock.post(
+            "http://elasticsearch.example.com:7080/_cat/indices",
+            text="green open some_index 1 1 0 0 230b 230b\n",
+        )
+        response = client.post(
+            f"{server_config.rest_uri}/elasticsearch",
+            json={"indices": "_cat/indices", "payload": {"size": 0}},
+        )
+        assert response.status_code == 500
+        assert response.json["message"] == "INTERNAL ERROR"
+
+    @staticmethod
+    def test_msearch(client, server_config, requests_mock):
+        requests_mock.post(
+            "http://elasticsearch.example.com:7080/_msearch", json={"responses": []}
+        )
+        response = client.post(
+            f"{server_config.rest_uri}/elasticsearch",
+            json={
+                "indices": "some_index",
+                "payload": [{"query": {"match_all": {}}}, {"size": 0}],
+            },
+        )
+        assert response.status_code == 200
+        assert response.json == {"responses": []}
+        es_request = requests_mock.last_request
+        assert es_request.headers["Content-Type"] == "application/x-ndjson"
+        assert es_request.body == (
+            b'{"index":"some_index"}\n{"query":{"match_all":{}}}\n'
+            b'{"index":"some_index"}\n{"size":0}\n'
+        )
+
 
 class TestGraphQL:
     @staticmethod
@@ -1,8 +1,9 @@
 import dateutil
+from datetime import datetime
 import pytest
 from typing import Callable
 
-from pbench.server.api.auth import Auth, UnknownUser
+from pbench.server.api.auth import UnknownUser
 from pbench.server.api.resources.query_apis import (
     ParamType,
     ConversionError,
@@ -20,7 +21,7 @@ class TestParamType:
 
     def test_enum(self):
         assert (
-            len(ParamType.__members__) == 4
+            len(ParamType.__members__) == 5
         ), "Number of ParamType ENUM values has changed; confirm test coverage!"
         for n, t in ParamType.__members__.items():
             assert str(t) == t.friendly.upper()
@@ -31,16 +32,24 @@ class TestParamType:
         (
             (ParamType.STRING, "x", "x"),
             (ParamType.JSON, {"key": "value"}, {"key": "value"}),
+            (ParamType.QUERY, {"key": "value"}, {"key": "value"}),
+            (ParamType.QUERY, [{"key": "value"}], [{"key": "value"}]),
             (ParamType.DATE, "2021-06-29", dateutil.parser.parse("2021-06-29")),
+            (ParamType.DATE, "2021-06", datetime(2021, 6, 1)),
+            (
+                ParamType.DATE,
+                "2021-06-29T12:34:56.789",
+                datetime(2021, 6, 29, 12, 34, 56, 789000),
+            ),
+            (
+                ParamType.DATE,
+                "2021-06-29T12:34:56+05:00",
+                dateutil.parser.parse("2021-06-29T12:34:56+05:00"),
+            ),
             (ParamType.USER, "drb", "drb"),
         ),
     )
-    def test_successful_conversions(self, test, monkeypatch):
-        def ok(user: str) -> str:
-            return user
-
-        monkeypatch.setattr(Auth, "validate_user", ok)
-
+    def test_successful_conversions(self, test, user_ok):
         ptype, value, expected = test
         result = ptype.convert(value)
         assert result == expected
@@ -50,21 +59,30 @@ class TestParamType:
         (
             (ParamType.STRING, {"not": "string"}),
             (ParamType.JSON, "not_json"),
+            (ParamType.JSON, [{"key": "value"}]),
+            (ParamType.QUERY, "not_json"),
+            (ParamType.QUERY, [{"key": "value"}, "not_json"]),
             (ParamType.DATE, "2021-06-45"),
-            (ParamType.USER, "drb"),
+            (ParamType.DATE, 20210629),
         ),
     )
-    def test_failed_conversions(self, test, monkeypatch):
-        def not_ok(user: str) -> str:
-            raise UnknownUser()
-
-        monkeypatch.setattr(Auth, "validate_user", not_ok)
-
+    def test_failed_conversions(self, test):
         ptype, value = test
         with pytest.raises(ConversionError) as exc:
             ptype.convert(value)
         assert str(exc).find(str(value))
 
+    def test_failed_username(self, user_unknown):
+        with pytest.raises(ConversionError) as exc:
+            ParamType.USER.convert("drb")
+        assert isinstance(exc.value.__context__, UnknownUser)
+        assert exc.value.__context__.username == "drb"
+
+    def test_failed_query_element(self):
+        with pytest.raises(ConversionError) as exc:
+            ParamType.QUERY.convert([{"key": "value"}, "not_json"])
+        assert str(exc.value) == "Value 'not_json' (str) cannot be parsed as a dict"
+
 
 class TestParameter:
     """
@@ -130,6 +148,11 @@ class TestSchema:
         with pytest.raises(MissingParameters):
             self.schema.validate({"key2": "abc"})
 
+    def test_null_optional(self):
+        with pytest.raises(MissingParameters) as exc:
+            self.schema.validate({"key1": "OK", "key3": None, "key2": None})
+        assert exc.value.keys == ["key2", "key3"]
+
     def test_missing_optional(self):
         test = {"key1": "OK"}
         assert test == self.schema.validate(test)
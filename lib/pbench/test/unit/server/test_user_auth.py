@@ -1,5 +1,8 @@
 import time
 import datetime
+import pytest
+from cachetools import TTLCache
+from pbench.server.api.auth import Auth, UnknownUser
 from pbench.server.database.models.users import User
 from pbench.server.database.models.active_tokens import ActiveTokens
 from pbench.server.database.database import Database
@@ -285,6 +288,19 @@ class TestUserAuthentication:
             response = login_user(client, server_config, "username", "newpass")
             assert response.status_code == 200
 
+            # Test username update; the old username is no longer valid
+            Auth.validate_user("username")
+            response = client.put(
+                f"{server_config.rest_uri}/user/username",
+                json={"username": "newuser"},
+                headers=dict(Authorization="Bearer " + data_login["auth_token"]),
+            )
+            assert response.status_code == 200
+            assert response.json["username"] == "newuser"
+            assert "username" not in Auth.valid_users
+            with pytest.raises(UnknownUser):
+                Auth.validate_user("username")
+
     @staticmethod
     def test_external_token_update(client, server_config):
         """ Test for external attempt at updating auth token"""
@@ -431,3 +447,32 @@ class TestUserAuthentication:
                 headers=dict(Authorization="Bearer " + data_login["auth_token"]),
             )
             assert response.status_code == 200
+
+
+class TestValidateUser:
+    @staticmethod
+    def test_validate_user_cache(monkeypatch):
+        queries = []
+
+        def query(username):
+            queries.append(username)
+            return None if username == "nobody" else username
+
+        monkeypatch.setattr(User, "query", query)
+        monkeypatch.setattr(Auth, "valid_users", TTLCache(maxsize=8, ttl=60))
+
+        # A valid user is only looked up once
+        assert Auth.validate_user("drb") == "drb"
+        assert Auth.validate_user("drb") == "drb"
+        assert queries == ["drb"]
+
+        # An unknown user is looked up every time
+        for _ in range(2):
+            with pytest.raises(UnknownUser):
+                Auth.validate_user("nobody")
+        assert queries == ["drb", "nobody", "nobody"]
+
+        # A forgotten user is looked up again
+        Auth.forget_user("drb")
+        assert Auth.validate_user("drb") == "drb"
+        assert queries == ["drb", "nobody", "nobody", "drb"]